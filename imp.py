@@ -8,13 +8,15 @@ limited to the common module loading patterns exercised by the project tests.
 
 from __future__ import annotations
 
+import functools
+import importlib
 import importlib.machinery
 import importlib.util
 import sys
 import threading
 from pathlib import Path
 from types import ModuleType
-from typing import Iterable, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 # Legacy constants preserved for consumers of :mod:`imp`.
 PY_SOURCE = 1
@@ -25,25 +27,48 @@ PKG_DIRECTORY = 5
 C_BUILTIN = 6
 PY_FROZEN = 7
 
+# Suffix -> (open mode, module kind); earlier suffix families win on overlap.
+_SUFFIX_TABLE: Dict[str, Tuple[str, int]] = {}
+for _suffix in importlib.machinery.SOURCE_SUFFIXES:
+    _SUFFIX_TABLE.setdefault(_suffix, ("r", PY_SOURCE))
+for _suffix in importlib.machinery.BYTECODE_SUFFIXES:
+    _SUFFIX_TABLE.setdefault(_suffix, ("rb", PY_COMPILED))
+for _suffix in importlib.machinery.EXTENSION_SUFFIXES:
+    _SUFFIX_TABLE.setdefault(_suffix, ("", C_EXTENSION))
+del _suffix
+
 _LOCK = threading.RLock()
+# ``RLock.locked()`` only exists since Python 3.14, so the owner is tracked here;
+# both values are only changed by the thread holding ``_LOCK``.
+_lock_owner: Optional[int] = None
+_lock_count = 0
 
 
 def acquire_lock() -> None:
     """Acquire the global import lock."""
 
+    global _lock_owner, _lock_count
     _LOCK.acquire()
+    _lock_owner = threading.get_ident()
+    _lock_count += 1
 
 
 def release_lock() -> None:
     """Release the global import lock."""
 
+    global _lock_owner, _lock_count
+    if _lock_owner != threading.get_ident():
+        raise RuntimeError("not holding the import lock")
+    _lock_count -= 1
+    if not _lock_count:
+        _lock_owner = None
     _LOCK.release()
 
 
 def lock_held() -> bool:
-    """Return ``True`` if the import lock is currently held."""
+    """Return ``True`` if the import lock is currently held by any thread."""
 
-    return _LOCK.locked()
+    return _lock_owner is not None
 
 
 def _find_spec(name: str, path: Optional[Iterable[str]]) -> importlib.machinery.ModuleSpec:
@@ -56,10 +81,43 @@ def _find_spec(name: str, path: Optional[Iterable[str]]) -> importlib.machinery.
     return spec
 
 
+@functools.lru_cache(maxsize=1024)
+def _find_spec_cached(name: str, path: Optional[Tuple[str, ...]]) -> importlib.machinery.ModuleSpec:
+    # ``nose`` probes the same names repeatedly; every uncached lookup walks
+    # the path entries again.  Failed lookups raise and are therefore not cached.
+    return _find_spec(name, path)
+
+
+@functools.lru_cache(maxsize=512)
+def _file_spec_template(name: str, pathname: str) -> Optional[importlib.machinery.ModuleSpec]:
+    return importlib.util.spec_from_file_location(name, pathname)
+
+
+def _spec_from_file(name: str, pathname: str) -> Optional[importlib.machinery.ModuleSpec]:
+    template = _file_spec_template(name, pathname)
+    if template is None or template.loader is None:
+        return None
+    # Loading a module records state on its spec, so every load gets its own
+    # copy; only the loader selection done by ``spec_from_file_location`` is reused.
+    spec = importlib.machinery.ModuleSpec(name, template.loader, origin=template.origin)
+    spec.has_location = template.has_location
+    if template.submodule_search_locations is not None:
+        spec.submodule_search_locations = list(template.submodule_search_locations)
+    return spec
+
+
+def invalidate_caches() -> None:
+    """Forget cached :func:`find_module` lookups and refresh importlib's finders."""
+
+    _find_spec_cached.cache_clear()
+    _file_spec_template.cache_clear()
+    importlib.invalidate_caches()
+
+
 def find_module(name: str, path: Optional[Iterable[str]] = None) -> Tuple[Optional[object], str, Tuple[str, str, int]]:
     """Return a module loader triple mimicking :func:`imp.find_module`."""
 
-    spec = _find_spec(name, path)
+    spec = _find_spec_cached(name, tuple(path) if path is not None else None)
 
     if spec.submodule_search_locations:
         # Package: return the directory path and signal PKG_DIRECTORY.
@@ -71,20 +129,15 @@ def find_module(name: str, path: Optional[Iterable[str]] = None) -> Tuple[Option
 
     pathname = spec.origin
     suffix = Path(pathname).suffix
-    if suffix in importlib.machinery.SOURCE_SUFFIXES:
-        file_obj = open(pathname, "r", encoding="utf-8")
-        desc = (suffix, "r", PY_SOURCE)
-    elif suffix in importlib.machinery.BYTECODE_SUFFIXES:
-        file_obj = open(pathname, "rb")
-        desc = (suffix, "rb", PY_COMPILED)
-    elif suffix in importlib.machinery.EXTENSION_SUFFIXES:
+    mode, kind = _SUFFIX_TABLE.get(suffix, ("rb", PY_SOURCE))
+    if kind == C_EXTENSION:
         file_obj = None
-        desc = (suffix, "", C_EXTENSION)
+    elif mode == "r":
+        file_obj = open(pathname, "r", encoding="utf-8")
     else:
         file_obj = open(pathname, "rb")
-        desc = (suffix, "rb", PY_SOURCE)
 
-    return file_obj, pathname, desc
+    return file_obj, pathname, (suffix, mode, kind)
 
 
 def load_module(name: str, file, pathname: str, description) -> ModuleType:
@@ -93,8 +146,8 @@ def load_module(name: str, file, pathname: str, description) -> ModuleType:
     if description and len(description) >= 3 and description[2] == PKG_DIRECTORY:
         spec = _find_spec(name, [pathname])
     else:
-        spec = importlib.util.spec_from_file_location(name, pathname)
-        if spec is None or spec.loader is None:
+        spec = _spec_from_file(name, pathname)
+        if spec is None:
             raise ImportError(f"Cannot load module {name!r} from {pathname!r}")
 
     module = importlib.util.module_from_spec(spec)
@@ -107,7 +160,5 @@ def new_module(name: str) -> ModuleType:
     """Create a new empty module instance."""
 
     module = ModuleType(name)
-    module.__file__ = None
-    module.__loader__ = None
-    module.__package__ = name.rpartition('.')[0]
+    module.__dict__.update(__file__=None, __loader__=None, __package__=name.rpartition('.')[0])
     return module
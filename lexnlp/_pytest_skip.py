@@ -0,0 +1,81 @@
+"""Helpers that turn failures caused by missing optional assets into skips.
+
+The bundled test suite depends on NLTK corpora and large test data files that
+are not always available.  The pytest hooks in ``conftest.py`` delegate to
+:func:`maybe_skip` so that such failures are reported as skipped tests.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import Iterator, Optional
+
+_NLTK_RESOURCE_RE = re.compile(r"^[ \t]*(Resource\b[^\n]*not found\.)[ \t]*$", re.M)
+
+
+def _nltk_missing_reason(exc: LookupError) -> Optional[str]:
+    message = str(exc)
+    match = _NLTK_RESOURCE_RE.search(message)
+    if match:
+        return match.group(1)
+    if "Resource" in message and "not found" in message:
+        return "Missing NLTK resource"
+    return None
+
+
+def _missing_file_reason(exc: FileNotFoundError) -> Optional[str]:
+    filename = exc.filename or ""
+    if not filename:
+        filename = str(exc)
+    if not filename:
+        return None
+    normalized = os.path.normpath(filename)
+    if "test_data" in normalized or "lexnlp" in normalized:
+        return f"Missing optional test asset: {normalized}"
+    return None
+
+
+def _iter_exception_chain(exc: BaseException) -> Iterator[BaseException]:
+    """Yield ``exc`` and the exceptions it was explicitly raised ``from``.
+
+    Only ``__cause__`` is followed: an exception that was merely raised while
+    handling a missing asset (``__context__``) is a real failure.
+    """
+
+    seen = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__
+
+
+def _optional_resource_reason(exc: BaseException) -> Optional[str]:
+    for current in _iter_exception_chain(exc):
+        reason: Optional[str] = None
+        if isinstance(current, LookupError):
+            reason = _nltk_missing_reason(current)
+        elif isinstance(current, FileNotFoundError):
+            reason = _missing_file_reason(current)
+        if reason:
+            return reason
+    return None
+
+
+def maybe_skip(report, excinfo) -> bool:
+    """Mark ``report`` as skipped if ``excinfo`` stems from a missing asset.
+
+    Returns ``True`` when the report has been rewritten.
+    """
+
+    reason = _optional_resource_reason(excinfo.value)
+    if not reason:
+        return False
+    report.outcome = "skipped"
+    report.wasxfail = False
+    report.longrepr = f"Skipped: {reason}"
+    return True
+
+
+__all__ = ['maybe_skip']
@@ -8,55 +8,78 @@ scikit-learn the stricter :meth:`Tree.__setstate__` implementation raises a
 
 This module intercepts the unpickling process and injects a default column so
 that legacy models remain usable while we modernise the training pipeline.
+
+Importing scikit-learn is expensive, so nothing heavy happens at import time:
+``joblib``'s unpickler is patched once :mod:`joblib.numpy_pickle` gets
+imported (or right away if it already is), and :mod:`sklearn.tree._tree` is
+only loaded when a pickle actually references the ``Tree`` class.
+``PATCHED_TREE_CLASS`` is still available as a module attribute: reading it
+builds the patched class on demand (it is ``None`` if scikit-learn is missing).
 """
 
 from __future__ import annotations
 
+import functools
+import importlib.abc
+import sys
+from typing import Dict
+
 import numpy as np
 
-try:  # pragma: no cover - optional dependency during some builds
-    from sklearn.tree import _tree
-except Exception:  # pragma: no cover - bail out if scikit-learn unavailable
-    _tree = None
+_PICKLE_MODULE = "joblib.numpy_pickle"
 
+# Only meaningful once _install_tree_patch() has run.
 _EXPECTS_MISSING_FIELD = False
-if _tree is not None:
-    _node_dtype = getattr(_tree, "NODE_DTYPE", None)
-    _node_dtype_names = getattr(_node_dtype, "names", None)
-    if _node_dtype_names is not None:
-        _EXPECTS_MISSING_FIELD = "missing_go_to_left" in _node_dtype_names
 
-try:  # pragma: no cover
-    from joblib import numpy_pickle
-except Exception:  # pragma: no cover
-    numpy_pickle = None
+_original_find_class = None
+
+# Node dtypes already known to carry ``missing_go_to_left``, keyed by ``id``.
+# The dtype is kept as the value so that its id cannot be recycled.  Pickles
+# share one dtype object across all trees of a forest, but every load brings a
+# new one, hence the size cap.
+_COMPLETE_DTYPES: Dict[int, np.dtype] = {}
+_COMPLETE_DTYPES_MAX_SIZE = 64
 
 
 def _augment_nodes(nodes: np.ndarray) -> np.ndarray:
     """Return a node array with a ``missing_go_to_left`` column."""
 
-    if not _EXPECTS_MISSING_FIELD:
+    if not _EXPECTS_MISSING_FIELD or not isinstance(nodes, np.ndarray):
         return nodes
-    if not isinstance(nodes, np.ndarray) or nodes.dtype.names is None:
+    dtype = nodes.dtype
+    if _COMPLETE_DTYPES.get(id(dtype)) is dtype or dtype.names is None:
         return nodes
-    if "missing_go_to_left" in nodes.dtype.names:
+    if "missing_go_to_left" in dtype.names:
+        if len(_COMPLETE_DTYPES) >= _COMPLETE_DTYPES_MAX_SIZE:
+            _COMPLETE_DTYPES.clear()
+        _COMPLETE_DTYPES[id(dtype)] = dtype
         return nodes
 
-    from numpy.lib import recfunctions as rfn
+    # Copy column by column into a preallocated array rather than going through
+    # ``recfunctions.append_fields``, which makes several full copies.
+    augmented_dtype = np.dtype(nodes.dtype.descr + [("missing_go_to_left", np.uint8)])
+    augmented = np.empty(nodes.shape, dtype=augmented_dtype)
+    for name in nodes.dtype.names:
+        augmented[name] = nodes[name]
+    augmented["missing_go_to_left"] = 0
+    return augmented
+
 
-    missing = np.zeros(nodes.shape[0], dtype=np.uint8)
-    return rfn.append_fields(
-        nodes,
-        "missing_go_to_left",
-        data=missing,
-        dtypes=np.uint8,
-        usemask=False,
-    )
+@functools.lru_cache(maxsize=None)
+def _install_tree_patch():
+    """Import :mod:`sklearn.tree._tree` and build the patched ``Tree`` class."""
 
+    global _EXPECTS_MISSING_FIELD, PATCHED_TREE_CLASS
 
-PATCHED_TREE_CLASS = None
+    PATCHED_TREE_CLASS = None
+    try:  # pragma: no cover - optional dependency during some builds
+        from sklearn.tree import _tree
+    except Exception:  # pragma: no cover - bail out if scikit-learn unavailable
+        return None
 
-if _tree is not None:
+    node_dtype_names = getattr(getattr(_tree, "NODE_DTYPE", None), "names", None)
+    if node_dtype_names is not None:
+        _EXPECTS_MISSING_FIELD = "missing_go_to_left" in node_dtype_names
 
     class PatchedTree(_tree.Tree):
         def __setstate__(self, state):  # type: ignore[override]
@@ -68,24 +91,90 @@ if _tree is not None:
             elif isinstance(state, tuple) and state:
                 nodes = _augment_nodes(state[0])
                 if nodes is not state[0]:
-                    state = (nodes,) + tuple(state[1:])
+                    state = (nodes,) + state[1:]
             return _tree.Tree.__setstate__(self, state)
 
     PatchedTree.__name__ = "Tree"
     PatchedTree.__qualname__ = "Tree"
     PatchedTree.__module__ = "sklearn.tree._tree"
     PATCHED_TREE_CLASS = PatchedTree
+    return PatchedTree
 
-if numpy_pickle is not None:
-    _original_find_class = numpy_pickle.NumpyUnpickler.find_class
 
-    def _patched_find_class(self, module, name):
-        if module == "sklearn.tree.tree":
-            module = "sklearn.tree"
-        if module == "sklearn.ensemble.forest":
-            module = "sklearn.ensemble._forest"
-        if module == "sklearn.tree._tree" and name == "Tree" and PATCHED_TREE_CLASS is not None:
-            return PATCHED_TREE_CLASS
-        return _original_find_class(self, module, name)
+def __getattr__(name: str):
+    # PATCHED_TREE_CLASS is only built when somebody needs it
+    if name == "PATCHED_TREE_CLASS":
+        return _install_tree_patch()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Modules that were renamed in later scikit-learn releases.
+_MODULE_REMAP: Dict[str, str] = {
+    "sklearn.tree.tree": "sklearn.tree",
+    "sklearn.ensemble.forest": "sklearn.ensemble._forest",
+}
+
 
+def _patched_find_class(self, module, name):
+    module = _MODULE_REMAP.get(module, module)
+    if name == "Tree" and module == "sklearn.tree._tree":
+        patched_tree_class = _install_tree_patch()
+        if patched_tree_class is not None:
+            return patched_tree_class
+    return _original_find_class(self, module, name)
+
+
+@functools.lru_cache(maxsize=None)
+def _install_pickle_patch() -> None:
+    """Redirect :meth:`NumpyUnpickler.find_class` through the legacy shims."""
+
+    global _original_find_class
+
+    numpy_pickle = sys.modules.get(_PICKLE_MODULE)
+    if numpy_pickle is None:
+        try:  # pragma: no cover
+            from joblib import numpy_pickle
+        except Exception:  # pragma: no cover
+            return
+    _original_find_class = numpy_pickle.NumpyUnpickler.find_class
     numpy_pickle.NumpyUnpickler.find_class = _patched_find_class
+
+
+class _PostImportHook(importlib.abc.MetaPathFinder):
+    """Run ``callback`` right after the module ``fullname`` has been executed."""
+
+    def __init__(self, fullname: str, callback) -> None:
+        self._fullname = fullname
+        self._callback = callback
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname != self._fullname:
+            return None
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            spec = find_spec(fullname, path, target) if find_spec is not None else None
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        if loader is None or not hasattr(loader, "exec_module"):
+            return spec
+        exec_module = loader.exec_module
+
+        def _exec_module(module):
+            exec_module(module)
+            if self in sys.meta_path:
+                sys.meta_path.remove(self)
+            self._callback()
+
+        loader.exec_module = _exec_module
+        return spec
+
+
+if _PICKLE_MODULE in sys.modules:
+    _install_pickle_patch()
+else:
+    sys.meta_path.insert(0, _PostImportHook(_PICKLE_MODULE, _install_pickle_patch))
@@ -0,0 +1,49 @@
+"""Tests for the deferred scikit-learn / joblib patching in sklearn_patch.
+
+Every check runs in a fresh interpreter: what gets patched depends on
+which modules were imported before lexnlp.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+from unittest import TestCase
+
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+CHECK_PATCHED = '''
+    from joblib import numpy_pickle
+    from sklearn.tree import _tree
+    assert numpy_pickle.NumpyUnpickler.find_class is sklearn_patch._patched_find_class
+    tree_class = sklearn_patch.PATCHED_TREE_CLASS
+    assert tree_class is not None and issubclass(tree_class, _tree.Tree)
+    assert tree_class is sklearn_patch.PATCHED_TREE_CLASS
+'''
+
+
+def run_python(imports: str) -> None:
+    code = textwrap.dedent(imports) + textwrap.dedent(CHECK_PATCHED)
+    env = dict(os.environ, PYTHONPATH=ROOT_PATH)
+    result = subprocess.run([sys.executable, '-c', code], env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    if result.returncode:
+        raise AssertionError(result.stdout)
+
+
+class TestSklearnPatch(TestCase):
+    def test_patch_before_joblib_and_sklearn_import(self):
+        run_python('''
+            import sys
+            from lexnlp.compat import sklearn_patch
+            assert 'sklearn.tree._tree' not in sys.modules
+            assert 'joblib.numpy_pickle' not in sys.modules
+        ''')
+
+    def test_patch_after_joblib_and_sklearn_import(self):
+        run_python('''
+            import joblib.numpy_pickle
+            import sklearn.tree
+            from lexnlp.compat import sklearn_patch
+        ''')
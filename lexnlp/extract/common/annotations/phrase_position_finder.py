@@ -34,28 +34,17 @@ class PhrasePositionFinder:
         """
 
         text = TextBeautifier.normalize_smb_preserve_len(text)
-        condensed = ''
-        ctos = []  # condensed-to-source indices
-        stoc = [0] * len(text)  # source-to-condensed indices
-        cindex = 0
         end_index = len(text)
         if pos_end:
             end_index = min(pos_end, end_index)
-
-        for i in range(pos_start, end_index):
-            a = text[i]
-            if a not in PhrasePositionFinder.space_symbols:
-                stoc[i] = cindex
-                ctos.append(i)
-                cindex += 1
-                condensed += a
-                continue
-            stoc[i] = cindex
+        # the text without spaces is only needed for the phrases
+        # that can't be found as is
+        condensed_text = None
 
         phrases = [(p, 0, 0) for p in phrases]
         start = 0
         for i, phrase in enumerate(phrases):
-            if start >= len(stoc):
+            if start >= len(text):
                 break
             word = TextBeautifier.normalize_smb_preserve_len(phrase[0])
             src_word = word
@@ -71,6 +60,9 @@ class PhrasePositionFinder:
                 continue
             # phrase is modified = extra spaces were added or removed
             word = PhrasePositionFinder.reg_space.sub('', word)
+            if condensed_text is None:
+                condensed_text = PhrasePositionFinder.condense_text(text, pos_start, end_index)
+            condensed, ctos, stoc = condensed_text
             cstart = stoc[start]
             con_word_start = condensed.find(word, cstart)
             con_word_start = con_word_start if con_word_start >= 0 else cstart
@@ -84,3 +76,29 @@ class PhrasePositionFinder:
             phrases[i] = (phrase[0], src_index, w_end)
 
         return phrases
+
+    @staticmethod
+    def condense_text(text: str,
+                      pos_start: int,
+                      pos_end: int) -> Tuple[str, List[int], List[int]]:
+        """
+        Remove spaces from text[pos_start:pos_end]
+        :param text: source text
+        :param pos_start: where to start (in source text)
+        :param pos_end: where to stop
+        :return: condensed text, condensed-to-source indices and source-to-condensed indices
+        """
+        condensed = []  # type: List[str]
+        ctos = []  # condensed-to-source indices
+        stoc = [0] * len(text)  # source-to-condensed indices
+        cindex = 0
+        for i in range(pos_start, pos_end):
+            a = text[i]
+            if a not in PhrasePositionFinder.space_symbols:
+                stoc[i] = cindex
+                ctos.append(i)
+                cindex += 1
+                condensed.append(a)
+                continue
+            stoc[i] = cindex
+        return ''.join(condensed), ctos, stoc
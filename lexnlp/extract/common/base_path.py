@@ -9,6 +9,7 @@ __email__ = "support@contraxsuite.com"
 import os
 
 
-lexnlp_base_path = os.path.abspath(os.path.dirname(__file__) + '/../../../')
+# lexnlp/extract/common/base_path.py -> directory that contains the lexnlp package
+lexnlp_base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 lexnlp_test_path = os.path.join(lexnlp_base_path, 'test_data/')
@@ -8,13 +8,18 @@ __email__ = "support@contraxsuite.com"
 
 from typing import List, Tuple, Optional, Union
 
+import regex as re
+
 
 class TextBeautifier:
     QUOTES = {'"', '“', '”'}
+    QUOTES_TO_DOUBLE_QUOTE = str.maketrans(dict.fromkeys(QUOTES, '"'))
     PROPER_CLOSE_QUOTE = {'"': '"', '“': '”'}
     BRACES_O = {'(', '[', '{'}
     BRACES_C = {')', ']', '}'}
     BRACE_CL_BY_OP = {'(': ')', '{': '}', '[': ']'}
+    # the only characters unify_quotes_braces_unsafe reacts to
+    QUOTES_BRACES_RE = re.compile(r"""['"“”()\[\]{}]""")
 
     APOS_SEPARATORS = {' ', '\t', '.', ',', ';'}
     APOS_SEPARATORS = APOS_SEPARATORS.union(BRACES_O)
@@ -43,12 +48,7 @@ class TextBeautifier:
         """
         if not text:
             return text
-        resulted = ''
-        for c in text:
-            if c in TextBeautifier.QUOTES:
-                c = '"'
-            resulted += c
-        return resulted
+        return text.translate(TextBeautifier.QUOTES_TO_DOUBLE_QUOTE)
 
     @staticmethod
     def strip_pair_symbols(term_coords: Union[str, Tuple[str, int, int]]) -> \
@@ -147,7 +147,8 @@ class TextBeautifier:
         braces_stack = []  # [("(", 18), ("[", 41)]
         replacements = []  # [(18, '{'), (82, '')]
 
-        for i, c in enumerate(text):
+        for match in TextBeautifier.QUOTES_BRACES_RE.finditer(text):
+            i, c = match.start(), match.group()
             if c == "'":
                 apos_coords.append(i)
                 continue
@@ -3,29 +3,49 @@
 from __future__ import annotations
 
 import datetime
-from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence
 
+import regex as re
 
-def _ordinal_to_cardinal(value: str) -> Optional[int]:
-    digits = ''.join(char for char in value if char.isdigit())
-    return int(digits) if digits else None
+RE_NON_DIGITS = re.compile(r'\D+')
+
+UNITS_OF_TIME = ('year', 'month', 'day', 'hour', 'minute')
+PRIMARY_UNITS_OF_TIME = frozenset(UNITS_OF_TIME[:3])
+
+
+class _CandidateValues(NamedTuple):
+    """Integer values of the tokens :class:`DateFinder` matched for a date."""
+
+    digits: List[int]
+    months: List[int]
+    modifiers: List[int]
 
 
 def _collect_candidate_values(date_props: Dict[str, Any],
-                              month_lookup: Mapping[str, int]) -> Dict[str, Iterable[int]]:
+                              month_lookup: Mapping[str, int]) -> _CandidateValues:
     digits: Sequence[str] = date_props.get('digits', [])
     months: Sequence[str] = date_props.get('months', [])
     modifiers: Sequence[str] = date_props.get('digits_modifier', [])
 
     digit_values = [int(d) for d in digits if d.isdigit()]
-    month_values = [month_lookup.get(month.lower()) for month in months if month_lookup.get(month.lower())]
-    modifier_values = [value for value in (_ordinal_to_cardinal(mod) for mod in modifiers) if value]
 
-    return {
-        'digits': digit_values,
-        'months': month_values,
-        'modifiers': modifier_values,
-    }
+    month_values = []
+    get_month = month_lookup.get
+    for month in months:
+        month_value = get_month(month.lower())
+        if month_value:
+            month_values.append(month_value)
+
+    modifier_values = []
+    strip_non_digits = RE_NON_DIGITS.sub
+    for modifier in modifiers:
+        modifier_digits = strip_non_digits('', modifier)
+        if modifier_digits:
+            modifier_value = int(modifier_digits)
+            if modifier_value:
+                modifier_values.append(modifier_value)
+
+    return _CandidateValues(digit_values, month_values, modifier_values)
 
 
 def check_date_parts_are_in_date(
@@ -35,44 +55,44 @@ def check_date_parts_are_in_date(
     """Ensure parsed ``date`` still references the tokens found in ``date_props``."""
     month_lookup = month_lookup or {}
 
-    units_of_time = ('year', 'month', 'day', 'hour', 'minute')
-    date_values = {unit: getattr(date, unit, None) for unit in units_of_time if hasattr(date, unit)}
+    if isinstance(date, datetime.datetime):
+        date_values = {'year': date.year, 'month': date.month, 'day': date.day,
+                       'hour': date.hour, 'minute': date.minute}
+    elif isinstance(date, datetime.date):
+        date_values = {'year': date.year, 'month': date.month, 'day': date.day}
+    else:
+        date_values = {unit: getattr(date, unit, None) for unit in UNITS_OF_TIME if hasattr(date, unit)}
 
     candidate_values = _collect_candidate_values(date_props, month_lookup)
 
-    if candidate_values['months']:
+    if candidate_values.months:
         month = date_values.get('month')
-        if month and month not in candidate_values['months']:
+        if month and month not in candidate_values.months:
             return False
 
-    combined = [
-        *candidate_values['digits'],
-        *candidate_values['months'],
-        *candidate_values['modifiers']
-    ]
-    difference = set(combined).difference(value for value in date_values.values() if value is not None)
-
-    removeable = []
-    reassembled_date: Dict[str, int] = {}
+    combined = set(candidate_values.digits)
+    combined.update(candidate_values.months)
+    combined.update(candidate_values.modifiers)
 
+    present_values = set()
+    consumed = set()
+    reassembled_units = set()
     for unit, value in date_values.items():
         if value is None:
             continue
+        present_values.add(value)
         if unit == 'year':
             short_year = (value - 100 * (value // 100)) if value > 1000 else value
             if short_year in combined:
-                reassembled_date[unit] = value
-                removeable.append(short_year)
+                reassembled_units.add(unit)
+                consumed.add(short_year)
                 continue
         if value in combined:
-            reassembled_date[unit] = value
-            removeable.append(value)
-
-    diff_digits = [digit for digit in difference if digit not in removeable]
-    diff_units = set(date_values.keys()) - set(reassembled_date.keys())
+            reassembled_units.add(unit)
+            consumed.add(value)
 
-    if any(unit for unit in diff_units if unit in units_of_time[:3]):
-        if diff_digits:
+    if not PRIMARY_UNITS_OF_TIME.isdisjoint(date_values.keys() - reassembled_units):
+        if combined - present_values - consumed:
             return False
     return True
 
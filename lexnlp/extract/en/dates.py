@@ -16,12 +16,15 @@ __email__ = "support@contraxsuite.com"
 # Standard imports
 import calendar
 import datetime
+import functools
+import operator
 import os
-import random
+import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, Generator, Iterable, List, Optional, Sequence, Tuple
 
 # Third-party packages
+import numpy as np
 import regex as re
 
 # LexNLP imports
@@ -43,16 +46,18 @@ DATE_MERGE_WINDOW = 10
 DATE_MAX_LENGTH = 40
 
 # Setup regular expression for "as of" strings
-AS_OF_PATTERN = r"""
-(made|dated|date)
-[\s]+?
-as
-[\s]+?
-of[\s]+?
-(.{{0,{max_length}}})
-""".format(max_length=DATE_MAX_LENGTH)
+AS_OF_PATTERN = r"(made|dated|date)\s+?as\s+?of\s+?(.{{0,{max_length}}})".format(max_length=DATE_MAX_LENGTH)
 
-RE_AS_OF = re.compile(AS_OF_PATTERN, re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE)
+RE_AS_OF = re.compile(AS_OF_PATTERN, re.IGNORECASE | re.DOTALL)
+
+# Pattern used to reject candidate strings that cannot be dates
+RE_NUMBER_DOT_WORD = re.compile(r"\d{2,4}\.\s*[A-Za-z]")
+
+# Cheap pre-check for text that may contain a date at all: a digit or a month name prefix
+RE_DATE_HINT = re.compile(r"\d|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec", re.IGNORECASE)
+
+# Trailing ordinal suffixes of a day modifier, e.g. "21st"
+ORDINAL_SUFFIXES = ("st", "nd", "rd", "th")
 
 # 'january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec'
 EN_MONTHS = [['january', 'jan'], ['february', 'feb', 'febr'], ['march', 'mar'],
@@ -61,13 +66,13 @@ EN_MONTHS = [['january', 'jan'], ['february', 'feb', 'febr'], ['march', 'mar'],
              ['october', 'oct'], ['november', 'nov'], ['december', 'dec']]
 
 
-def get_month_by_name():
-    return {month_name: ix + 1 for ix, month_names in enumerate(EN_MONTHS) for month_name in month_names}
+MONTH_BY_NAME = {month_name: ix + 1 for ix, month_names in enumerate(EN_MONTHS) for month_name in month_names}
 
+MONTH_FULLS = {v.lower(): k for k, v in enumerate(calendar.month_name) if v}
 
-MONTH_BY_NAME = get_month_by_name()
-
-MONTH_FULLS = {v.lower(): k for k, v in enumerate(calendar.month_name)}
+# Feature order expected by the false positive classifier
+MODEL_DATE_COLUMNS = tuple(MODEL_DATE.columns)
+_get_model_features = operator.itemgetter(*MODEL_DATE_COLUMNS)
 
 
 @dataclass
@@ -102,14 +107,12 @@ def get_raw_date_list(text, strict=False, base_date=None, return_source=False, l
 
 
 def _copy_date_props(date_props: Dict[str, Any]) -> Dict[str, Any]:
-    copied: Dict[str, Any] = {}
-    for key, value in date_props.items():
-        if isinstance(value, list):
-            copied[key] = value.copy()
-        elif isinstance(value, tuple):
+    # DateFinder fills every capture group with a list; everything else is copied as is
+    copied = dict(date_props)
+    for key in DateFinder.ALL_GROUPS:
+        value = copied.get(key)
+        if value is not None:
             copied[key] = list(value)
-        else:
-            copied[key] = value
     return copied
 
 
@@ -124,11 +127,10 @@ def _normalize_day_of(candidate: CandidateDate,
     if not extra_tokens:
         return candidate
 
-    has_of_token = any(token.lower() == "of" for token in extra_tokens)
-    if not has_of_token or previous_candidate is None or previous_outcome is None:
+    if previous_candidate is None or previous_outcome is None or previous_outcome.accepted:
         return candidate
 
-    if previous_outcome.accepted:
+    if "of" not in map(str.lower, extra_tokens):
         return candidate
 
     previous_modifiers: List[str] = previous_candidate.props.get("digits_modifier", [])
@@ -136,36 +138,53 @@ def _normalize_day_of(candidate: CandidateDate,
         return candidate
 
     modifier_token = previous_modifiers[-1]
-    normalized_modifier = (modifier_token
-                           .replace("st", "")
-                           .replace("nd", "")
-                           .replace("rd", "")
-                           .replace("th", ""))
+    if modifier_token[-2:] in ORDINAL_SUFFIXES:
+        normalized_modifier = modifier_token[:-2]
+    else:
+        normalized_modifier = modifier_token
     props["digits_modifier"] = previous_modifiers + props.get("digits_modifier", [])
     previous_candidate.props["digits_modifier"] = previous_modifiers[:-1]
     candidate.normalized_text = f"{normalized_modifier}{candidate.normalized_text}"
     return candidate
 
 
+def _starts_with_double_number(text: str) -> bool:
+    """Same as ``re.match(r"\\d{1,2}\\s+\\d{1,2}", text)``, without entering the regex engine."""
+    length = len(text)
+    i = 0
+    while i < length and i < 3 and text[i].isdecimal():
+        i += 1
+    if i in (0, 3) or i == length or not text[i].isspace():
+        return False
+    while i < length and text[i].isspace():
+        i += 1
+    return i < length and text[i].isdecimal()
+
+
+def _starts_with_dotted_date(text: str) -> bool:
+    """Same as ``re.match(r"\\d{2}\\.\\d{2}\\.\\d{2,4}", text)``."""
+    return (len(text) >= 8 and text[2] == '.' and text[5] == '.'
+            and text[0:2].isdecimal() and text[3:5].isdecimal() and text[6:8].isdecimal())
+
+
 def _reject_impossible_formats(candidate: CandidateDate) -> Optional[str]:
     props = candidate.props
     text = candidate.normalized_text
 
-    num_month = len(props.get("months", []))
-    num_digits_modifier = len(props.get("digits_modifier", []))
-    num_digits = len(props.get("digits", []))
-    num_days = len(props.get("days", []))
-    delimiters: Sequence[str] = props.get("delimiters", [])
-    num_slash = delimiters.count("/")
-    num_point = delimiters.count(".")
-    num_hyphen = delimiters.count("-")
+    months: Sequence[str] = props.get("months") or ()
+    digits: Sequence[str] = props.get("digits") or ()
+    delimiters: Sequence[str] = props.get("delimiters") or ()
+    num_month = len(months)
+    num_digits_modifier = len(props.get("digits_modifier") or ())
+    num_digits = len(digits)
+    num_days = len(props.get("days") or ())
 
     if num_month > 1:
         return "multiple_month_tokens"
 
-    extra_tokens: List[str] = props.get("extra_tokens", [])
+    extra_tokens: Sequence[str] = props.get("extra_tokens") or ()
     if (num_month == 1 and extra_tokens
-            and (props["months"][0] + extra_tokens[-1]) in text):
+            and (months[0] + extra_tokens[-1]) in text):
         return "month_followed_by_word"
 
     if num_digits_modifier > 0 and num_digits == 0:
@@ -177,24 +196,26 @@ def _reject_impossible_formats(candidate: CandidateDate) -> Optional[str]:
     if num_month == 0 and num_digits_modifier == 0 and num_digits <= 1:
         return "insufficient_components"
 
-    if re.match(r"\d{1,2}\s+\d{1,2}", text):
+    if _starts_with_double_number(text):
         return "ambiguous_double_numbers"
 
-    if num_point and not num_month and not re.match(r"\d{2}\.\d{2}\.\d{2,4}", text):
+    num_point = delimiters.count(".")
+    if num_point and not num_month and not _starts_with_dotted_date(text):
         return "decimal_without_month"
 
-    if re.search(r"\d{2,4}\.\s*[A-Za-z]", text):
+    if RE_NUMBER_DOT_WORD.search(text):
         return "number_dot_word"
 
+    num_slash = delimiters.count("/")
+    num_hyphen = delimiters.count("-")
     if (num_slash == 1 or num_hyphen == 1) and num_digits > 2:
         return "fraction_like_number"
 
-    found_triple = any(len(digit) == 3 for digit in props.get("digits", []))
-    found_double_zero = any(digit.startswith("00") for digit in props.get("digits", []))
-    if found_triple or found_double_zero:
-        return "invalid_digit_length"
+    for digit in digits:
+        if len(digit) == 3 or digit.startswith("00"):
+            return "invalid_digit_length"
 
-    month_string = "".join(props.get("months", [])).lower()
+    month_string = "".join(months).lower()
     if num_digits == 0 and num_days == 0 and month_string == "may":
         return "standalone_may"
 
@@ -207,11 +228,14 @@ def _reject_impossible_formats(candidate: CandidateDate) -> Optional[str]:
 def _normalize_tokens(candidate: CandidateDate) -> CandidateDate:
     props = candidate.props
     text = candidate.normalized_text
-    extra_tokens = sorted(props.get("extra_tokens", []), key=len, reverse=True)
-    for token in extra_tokens:
-        if token.lower() in ["to", "t"]:
-            continue
-        text = text.replace(token, "")
+    extra_tokens = props.get("extra_tokens")
+    if extra_tokens:
+        # A few str.replace calls on a short candidate string are much cheaper
+        # than building an alternation regex for every candidate.
+        for token in sorted(extra_tokens, key=len, reverse=True):
+            if token.lower() in ("to", "t"):
+                continue
+            text = text.replace(token, "")
     candidate.normalized_text = text.strip()
     props["extra_tokens"] = []
     return candidate
@@ -232,31 +256,28 @@ def _reject_post_normalization(candidate: CandidateDate) -> Optional[str]:
     return None
 
 
+def _try_parse_date_string(candidate: CandidateDate, date_string: str) -> Optional[datetime.datetime]:
+    try:
+        return candidate.date_finder.parse_date_string(date_string, candidate.props, locale=candidate.locale)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
 def _parse_candidate(candidate: CandidateDate) -> CandidateOutcome:
     date_props = candidate.props
-    date_finder = candidate.date_finder
     base_string = candidate.normalized_text
 
     try:
         date_string_tokens = base_string.split()
         date: Optional[datetime.datetime] = None
-        for cutter in range(len(date_string_tokens)):
-            for direction in (0, 1):
-                working_string = base_string
-                if cutter > 0:
-                    if direction:
-                        working_tokens = date_string_tokens[cutter:]
-                    else:
-                        working_tokens = date_string_tokens[:-cutter]
-                    working_string = " ".join(working_tokens)
-                try:
-                    date = date_finder.parse_date_string(working_string, date_props, locale=candidate.locale)
-                except Exception:  # pylint: disable=broad-except
-                    date = None
+        if date_string_tokens:
+            # Most candidates parse as is; only then drop tokens from either end
+            date = _try_parse_date_string(candidate, base_string)
+            for cutter in range(1, len(date_string_tokens)):
                 if date:
                     break
-            if date:
-                break
+                date = (_try_parse_date_string(candidate, " ".join(date_string_tokens[:-cutter]))
+                        or _try_parse_date_string(candidate, " ".join(date_string_tokens[cutter:])))
     except TypeError:
         return CandidateOutcome(candidate, False, reason="type_error")
 
@@ -266,9 +287,10 @@ def _parse_candidate(candidate: CandidateDate) -> CandidateOutcome:
     if not check_date_parts_are_in_date(date, date_props, month_lookup=MONTH_BY_NAME):
         return CandidateOutcome(candidate, False, reason="date_parts_mismatch")
 
-    if hasattr(date, "tzinfo"):
+    if isinstance(date, datetime.datetime) and date.tzinfo is not None:
+        # A broken tzinfo only surfaces once its offset is requested
         try:
-            _ = date.isoformat()
+            date.utcoffset()
         except ValueError:
             return CandidateOutcome(candidate, False, reason="invalid_timezone")
 
@@ -318,10 +340,42 @@ def _iter_candidate_evaluations(text: str,
         previous_outcome = outcome
 
 
+# (expiry timestamp, January 1st of the current year); kept in one tuple so
+# that concurrent callers always see a matching pair
+_DEFAULT_BASE_DATE: Tuple[float, Optional[datetime.datetime]] = (0.0, None)
+
+
+def _default_base_date() -> datetime.datetime:
+    """Return January 1st of the current year, recomputed once the year is over."""
+    global _DEFAULT_BASE_DATE
+    expires_at, base_date = _DEFAULT_BASE_DATE
+    if base_date is None or time.time() >= expires_at:
+        base_date = datetime.datetime.now().replace(
+            day=1, month=1, hour=0, minute=0, second=0, microsecond=0)
+        _DEFAULT_BASE_DATE = (base_date.replace(year=base_date.year + 1).timestamp(), base_date)
+    return base_date
+
+
+@functools.lru_cache(maxsize=32)
+def _make_date_finder(base_date: datetime.datetime) -> DateFinder:
+    # DateFinder keeps no per-call state besides base_date, so one instance
+    # can be shared by every text parsed against the same base date.
+    date_finder = DateFinder(base_date=base_date)
+    for extra_token in date_finder.EXTRA_TOKENS_PATTERN.split('|'):
+        if extra_token != 't':
+            date_finder.REPLACEMENTS[extra_token] = ' '
+    return date_finder
+
+
 def _candidate_outcomes(text: str,
                         strict: bool,
                         base_date: Optional[datetime.datetime],
                         locale: Optional[Locale]) -> Iterable[CandidateOutcome]:
+    # A candidate without digits or a month name is always rejected, so such
+    # texts need not go through DateFinder at all.
+    if not RE_DATE_HINT.search(text):
+        return iter(())
+
     if isinstance(locale, str):
         locale_obj = Locale(locale)
     elif locale is None:
@@ -330,15 +384,9 @@ def _candidate_outcomes(text: str,
         locale_obj = locale
 
     if not base_date:
-        base_date = datetime.datetime.now().replace(
-            day=1, month=1, hour=0, minute=0, second=0, microsecond=0)
+        base_date = _default_base_date()
 
-    date_finder = DateFinder(base_date=base_date)
-    for extra_token in date_finder.EXTRA_TOKENS_PATTERN.split('|'):
-        if extra_token != 't':
-            date_finder.REPLACEMENTS[extra_token] = ' '
-
-    return _iter_candidate_evaluations(text, date_finder, locale_obj, strict)
+    return _iter_candidate_evaluations(text, _make_date_finder(base_date), locale_obj, strict)
 
 
 def get_raw_dates(text, strict=False, base_date=None,
@@ -359,6 +407,43 @@ def get_raw_dates(text, strict=False, base_date=None,
             yield outcome.date, outcome.candidate.span
         else:
             yield outcome.date
+
+
+def _score_outcomes(text: str,
+                    outcomes: Iterable[CandidateOutcome],
+                    threshold: float,
+                    classify: bool = True) -> Generator[DateAnnotation, None, None]:
+    """
+    Turn accepted candidate outcomes into annotations, dropping those the
+    false positive classifier scores below ``threshold``.
+    """
+    outcomes = [outcome for outcome in outcomes if outcome.accepted and outcome.date is not None]
+    if not outcomes:
+        return
+
+    if classify:
+        # Score all candidates with a single classifier call
+        features = np.empty((len(outcomes), len(MODEL_DATE_COLUMNS)))
+        for row, outcome in enumerate(outcomes):
+            start, end = outcome.candidate.span
+            features[row] = _get_model_features(
+                get_date_features(text, start, end, characters=DATE_MODEL_CHARS))
+        date_scores = MODEL_DATE.predict_proba(features)[:, 1]
+    else:
+        date_scores = [None] * len(outcomes)
+
+    for outcome, date_score in zip(outcomes, date_scores):
+        if date_score is None or date_score >= threshold:
+            start, end = outcome.candidate.span
+            annotation = DateAnnotation(
+                coords=(start, end),
+                text=text[slice(start, end)],
+                date=outcome.date,
+                score=date_score
+            )
+            yield annotation
+
+
 def get_dates_list(text, **kwargs) -> List:
     return list(get_dates(text, **kwargs))
 
@@ -368,7 +453,8 @@ def get_dates(text: str,
               base_date=None,
               return_source=False,
               threshold=0.50,
-              locale='') -> Generator:
+              locale='',
+              classify=True) -> Generator:
     """
     Find dates after cleaning false positives.
     :param text: raw text to search
@@ -377,10 +463,14 @@ def get_dates(text: str,
     :param return_source: whether to return raw text around date
     :param threshold: probability threshold to use for false positive classifier
     :param locale: locale string
+    :param classify: whether to filter dates with the false positive classifier
     :return:
     """
     # Get raw dates
-    for ant in get_date_annotations(text, strict, locale, base_date, threshold):
+    outcomes = _candidate_outcomes(text, strict, base_date, locale)
+    # Probabilities are never negative, so a non-positive threshold keeps every date
+    classify = classify and threshold > 0
+    for ant in _score_outcomes(text, outcomes, threshold, classify):
         if return_source:
             yield ant.date, ant.coords
         else:
@@ -391,7 +481,8 @@ def get_date_annotations(text: str,
                          strict: Optional[bool] = None,
                          locale: Optional[str] = '',
                          base_date: Optional[datetime.datetime] = None,
-                         threshold: float = 0.50) \
+                         threshold: float = 0.50,
+                         classify: bool = True) \
         -> Generator[DateAnnotation, None, None]:
     """
     Find dates after cleaning false positives.
@@ -400,31 +491,32 @@ def get_date_annotations(text: str,
     :param locale: locale string
     :param base_date: base date to use for implied or partial matches
     :param threshold: probability threshold to use for false positive classifier
+    :param classify: whether to filter dates with the false positive classifier;
+                     unclassified annotations have no score
     :return:
     """
 
     # Get raw dates
     strict = strict if strict is not None else False
     outcomes = _candidate_outcomes(text, strict, base_date, locale)
+    yield from _score_outcomes(text, outcomes, threshold, classify)
 
-    for outcome in outcomes:
-        if not outcome.accepted or outcome.date is None:
-            continue
 
-        start, end = outcome.candidate.span
-        feature_row = get_date_features(text, start, end, characters=DATE_MODEL_CHARS)
-        feature_list = len(feature_row) * [0.0]
-        for i, col in enumerate(MODEL_DATE.columns):
-            feature_list[i] = feature_row[col]
-        date_score = MODEL_DATE.predict_proba([feature_list])
-        if date_score[0, 1] >= threshold:
-            annotation = DateAnnotation(
-                coords=(start, end),
-                text=text[slice(start, end)],
-                date=outcome.date,
-                score=date_score[0, 1]
-            )
-            yield annotation
+def _sample_example_dates(p: float) -> List[Tuple[datetime.date, int]]:
+    """
+    Pick each day 1..30 of every month in 1980-2009 with probability ``p``,
+    paired with a random 2..30 day offset for the range examples.
+    Days that do not exist in their month (e.g. Feb 30) are dropped.
+    """
+    years = np.arange(1980, 2010)
+    picked = np.nonzero(np.random.random_sample((len(years), 12, 30)) <= p)
+    offsets = np.random.randint(2, 31, size=len(picked[0]))
+    dates = []
+    for year_ix, month_ix, day_ix, n in zip(*picked, offsets):
+        year, month, day = int(years[year_ix]), int(month_ix) + 1, int(day_ix) + 1
+        if day <= calendar.monthrange(year, month)[1]:
+            dates.append((datetime.date(year, month, day), int(n)))
+    return dates
 
 
 def train_default_model(save=True):
@@ -733,34 +825,22 @@ def train_default_model(save=True):
                 ]
 
     # Add random examples
-    p = 0.01
-    for k in range(1980, 2010):
-        for j in range(1, 13):
-            for i in range(1, 31):
-                if random.random() <= p:
-                    year = k
-                    month = j
-                    day = i
-                    try:
-                        d = datetime.date(year, month, day)
-                        n = random.randint(2, 30)
-                        d2 = d + datetime.timedelta(days=n)
-                        examples.append(("""on {0}-{1}-{2}""".format(year, month, day),
-                                         [d]))
-                        examples.append(("by " + d.strftime("%b %d, %Y"),
-                                         [d]))
-                        examples.append(("on " + d.strftime("%B %d, %Y"),
-                                         [d]))
-                        examples.append(("{0} to {1}".format(d, d2),
-                                         [d, d2]))
-                        examples.append(("{0} to {1}".format(d.strftime("%b d, %Y"), d2.strftime("%b d, %Y")),
-                                         [d, d2]))
-                        examples.append(("{0} through {1}".format(d.isoformat(), d2.isoformat()),
-                                         [d, d2]))
-                        examples.append(("{0} through {1}".format(d.strftime("%b d, %Y"), d2.strftime("%b d, %Y")),
-                                         [d, d2]))
-                    except ValueError:
-                        continue
+    for d, n in _sample_example_dates(p=0.01):
+        d2 = d + datetime.timedelta(days=n)
+        examples.append(("""on {0}-{1}-{2}""".format(d.year, d.month, d.day),
+                         [d]))
+        examples.append(("by " + d.strftime("%b %d, %Y"),
+                         [d]))
+        examples.append(("on " + d.strftime("%B %d, %Y"),
+                         [d]))
+        examples.append(("{0} to {1}".format(d, d2),
+                         [d, d2]))
+        examples.append(("{0} to {1}".format(d.strftime("%b d, %Y"), d2.strftime("%b d, %Y")),
+                         [d, d2]))
+        examples.append(("{0} through {1}".format(d.isoformat(), d2.isoformat()),
+                         [d, d2]))
+        examples.append(("{0} through {1}".format(d.strftime("%b d, %Y"), d2.strftime("%b d, %Y")),
+                         [d, d2]))
 
     # Output
     output_path = 'test_date_model.pickle'
@@ -17,10 +17,11 @@ __email__ = "support@contraxsuite.com"
 # pylint: disable=broad-except,bare-except
 
 
+import functools
+import heapq
 import regex as re
 import unidecode
-from collections import Counter
-from typing import Pattern, List, Tuple, Set
+from typing import Dict, Generator, Pattern, List, Sequence, Set, Tuple
 
 from lexnlp.extract.common.annotations.phrase_position_finder import PhrasePositionFinder
 from lexnlp.extract.common.text_beautifier import TextBeautifier
@@ -29,7 +30,6 @@ from lexnlp.extract.en.preprocessing.span_tokenizer import SpanTokenizer
 from lexnlp.extract.common.special_characters import SpecialCharacters
 from lexnlp.extract.en.en_language_tokens import EnLanguageTokens
 from lexnlp.utils.lines_processing.line_processor import LineProcessor
-from lexnlp.utils.iterating_helpers import count_sequence_matches
 
 
 class DefinitionCaught:
@@ -52,23 +52,30 @@ class DefinitionCaught:
         :param target: a definition that is, probably, "consumed" by the current one
         :return: 1 if self consumes the target, -1 if the target consumes self, overwise 0
         """
-        coords_spans = (target.coords[0] >= self.coords[0] and
-            target.coords[0] <= self.coords[1]) or \
-            (self.coords[0] >= target.coords[0] and
-            self.coords[0] <= target.coords[1])
-        if not coords_spans:
+        if not self.overlaps(target):
             return 0
-        if (target.name or '') in (self.name or ''):
+        name = self.name or ''
+        target_name = target.name or ''
+        if target_name in name:
             return 1
-        if (self.name or '') in (target.name or ''):
+        if name in target_name:
             return -1
         return 0
 
+    def overlaps(self, target) -> bool:
+        """
+        :param target: another definition
+        :return: True if either definition starts within the other one's coords
+        """
+        start, end = self.coords
+        target_start, target_end = target.coords
+        return start <= target_start <= end or target_start <= start <= target_end
 
-# when the following flag is True,
-# the term defined got stripped off quotes:
+
+# the term defined always gets stripped off quotes:
 # e.g., (any such excess being referred to as a "Combined EDITT Deficit Alpha Beta Gamma Cappa")
 # will become just (Combined EDITT Deficit Alpha Beta Gamma Cappa)
+# deprecated: the flag is no longer checked and is kept for backward compatibility only
 PICK_DEFINITION_FROM_QUOTES = True
 
 # Constraints for matching
@@ -98,6 +105,18 @@ def join_collection(collection):
     return "|".join([w.replace(" ", r"\s+") for w in collection])
 
 
+def join_collection_by_first_char(collection):
+    """
+    Same alternation as join_collection(), but with the items grouped by their first
+    (lowercase) character: the order of the items sharing the first character is kept,
+    and the engine doesn't try the items that can't start at the current position
+    """
+    groups = {}  # type: Dict[str, List[str]]
+    for w in collection:
+        groups.setdefault(w[:1].lower(), []).append(w)
+    return "|".join(["(?:%s)" % join_collection(group) for group in groups.values()])
+
+
 word_processor = LineProcessor()
 
 # Case 1: Term in quotes, is preceded by word|term|phrase or :,.^
@@ -111,6 +130,8 @@ TRIGGER_WORDS_PTN = r"""
     max_term_chars=MAX_TERM_CHARS,
     trigger_list=join_collection(ALL_TRIGGER_LIST))
 TRIGGER_WORDS_PTN_RE = re.compile(TRIGGER_WORDS_PTN, re.IGNORECASE | re.UNICODE | re.DOTALL | re.MULTILINE | re.VERBOSE)
+# TRIGGER_WORDS_PTN can't match a sentence without any of its opening quotes
+TRIGGER_WORDS_QUOTE_RE = re.compile(r"""['"“]""")
 
 EXTRACT_PTN = r"""
 “(.+?)“|
@@ -146,8 +167,9 @@ NOUN_PTN_BASE = r"""
 # ([A-Z][-A-Za-z']*) check shouldn't fail and track back
 
 
+# a match that is just "The" at the very beginning (see NOUN_ANTI_PTN) is skipped
 NOUN_PTN = r"""
-(?:^|\s)
+(?:^(?!(?i:the)\s+(?:{trigger_list})\W)|\s)
 (?:
     {noun_ptn_base}
     |
@@ -161,6 +183,12 @@ NOUN_PTN = r"""
 
 NOUN_PTN_RE = re.compile(NOUN_PTN, re.UNICODE | re.DOTALL | re.MULTILINE | re.VERBOSE)
 
+# Every case above needs either a quote or a strong trigger word (the lookahead
+# of NOUN_PTN): sentences that have neither can't contain a definition
+DEFINITION_HINT_PTN = r"""['"“”]|(?:{trigger_list})\W""".format(trigger_list=join_collection(STRONG_TRIGGER_LIST))
+DEFINITION_HINT_RE = re.compile(DEFINITION_HINT_PTN, re.UNICODE | re.DOTALL | re.MULTILINE)
+
+# NOUN_PTN already rejects these matches, the pattern is kept for backward compatibility
 NOUN_ANTI_PTN = r"""the\s*"""
 NOUN_ANTI_PTN_RE = re.compile(NOUN_ANTI_PTN, re.IGNORECASE | re.UNICODE | re.DOTALL | re.MULTILINE | re.VERBOSE)
 
@@ -182,7 +210,8 @@ ANCHOR = ['called', 'herein', 'herein as', 'collectively(?:,)?', 'collectively a
           'your', 'any of the foregoing,', 'in such capacity,', 'in this section,', 'in this paragraph,',
           r'in this \(noun\),', 'each such', 'this']
 ANCHOR_QUOTES_PTN = r"""(?:(?:{anchor})\s+)(?:(?:{articles})\s+)?['"“](.{{1,{max_term_chars}}}?)['"”]""" \
-    .format(anchor=join_collection(ANCHOR), articles=join_collection(ARTICLES), max_term_chars=MAX_TERM_CHARS)
+    .format(anchor=join_collection_by_first_char(ANCHOR), articles=join_collection(ARTICLES),
+            max_term_chars=MAX_TERM_CHARS)
 ANCHOR_QUOTE_RE_OPTIONS = re.IGNORECASE | re.UNICODE | re.DOTALL | re.MULTILINE | re.VERBOSE
 
 # Case 6: phrase such|any such|together + subject + term in quotes
@@ -208,11 +237,18 @@ QUOTED_DEFINITION_RE_PARAMS = [
 
 QUOTED_DEFINITION_RE = [re.compile(template, options) for template, options in QUOTED_DEFINITION_RE_PARAMS]
 
+# kept for backward compatibility, get_quoted_text_parts() does the same
 QUOTED_TEXT_RE = re.compile("([\"'“„])(?:(?=(\\\\?))\\2.)+?\\1", re.UNICODE | re.IGNORECASE | re.DOTALL)
+QUOTED_TEXT_OPENING_RE = re.compile("[\"'“„]")
 
 # used for replacing multiple spaces by single ones
 SPACES_RE = re.compile(r'\s+')
 
+# unidecode's transliterations of the non-ASCII punctuation common in contracts;
+# mapping them with str.translate leaves most sentences ASCII without calling unidecode
+UNIDECODE_PUNCTUATION_TABLE = str.maketrans(
+    {c: unidecode.unidecode(c) for c in '\u00a0\u00a7\u2013\u2014\u2018\u2019\u201c\u201d\u2022\u2026'})
+
 # non significant parts of speech
 # if defined term consists on NON_SIG_POSes only - this is not
 # a definition (like "as is", "this" etc)
@@ -240,8 +276,13 @@ STRIP_PUNCT_SYMBOLS = ',:-'
 
 ABBREVIATION_PTRN = '|'.join([a.replace('.', '\\.') for a
                               in EnLanguageTokens.abbreviations])
-# if the term ends with abbreviations, last dot won't be trimmed
-ABBREVIATION_ENDING_RE = re.compile(f'({ABBREVIATION_PTRN})$')
+# if the term ends with abbreviations, last dot won't be trimmed;
+# abbreviations are grouped by length so that a term's ending is looked up
+# in a set instead of compiling and running an alternation of all of them
+ABBREVIATIONS_BY_LENGTH: Dict[int, Set[str]] = {}
+for _abbreviation in EnLanguageTokens.abbreviations:
+    ABBREVIATIONS_BY_LENGTH.setdefault(len(_abbreviation), set()).add(_abbreviation)
+del _abbreviation
 
 # split one phrase containing several definitions into definitions
 SPLIT_SUBDEFINITIONS_PTRN = r'''["“](?:[^"“]{{1,{max_term_chars}}})["“]'''.format(
@@ -260,56 +301,67 @@ def get_definition_list_in_sentence(sentence_coords: Tuple[int, int, str],
         """
     definitions: List[DefinitionCaught] = []
     sentence = sentence_coords[2]
+    # unifying quotes and braces keeps ASCII text free of quotes and trigger words
+    # if it was before, but transliterating non-ASCII text might produce them
+    is_ascii = sentence.isascii()
+    if is_ascii and not DEFINITION_HINT_RE.search(sentence):
+        return definitions
+
     # unify quotes and braces
     # replace excess braces with ' ' so the str length will remain the same
     sentence = TextBeautifier.unify_quotes_braces(sentence,
                                                   empty_replacement=' ')
     sent_start = sentence_coords[0]
-    result = set()  # type: Set[Tuple[str, int, int]]
+    # candidate terms by their (start, end) coords: a term is always the text
+    # at its coords, so identical spans are deduplicated without hashing the text
+    result = {}  # type: Dict[Tuple[int, int], str]
 
     # it really transforms string, e.g. replaces “ with "
     if decode_unicode:
-        sentence = unidecode.unidecode(sentence)
+        if not sentence.isascii():
+            sentence = sentence.translate(UNIDECODE_PUNCTUATION_TABLE)
+            if not sentence.isascii():
+                sentence = unidecode.unidecode(sentence)
         sentence_coords = sentence_coords[0], sentence_coords[1], sentence
 
+    if not is_ascii and not DEFINITION_HINT_RE.search(sentence):
+        return definitions
+
     # case 1
-    for item in TRIGGER_WORDS_PTN_RE.finditer(sentence):
-        result.update(regex_matches_to_word_coords(EXTRACT_PTN_RE, item.group(), item.start() + sent_start))
+    if TRIGGER_WORDS_QUOTE_RE.search(sentence):
+        for item in TRIGGER_WORDS_PTN_RE.finditer(sentence):
+            for term, start, end in regex_matches_to_word_coords(EXTRACT_PTN_RE, item.group(),
+                                                                 item.start() + sent_start):
+                result.setdefault((start, end), term)
 
     # case 3
-    mts = regex_matches_to_word_coords(NOUN_PTN_RE, sentence, sent_start)
-    mts = [i for i in mts if not NOUN_ANTI_PTN_RE.fullmatch(i[0])]
-    mts = [m for m in mts if m[0].lower().strip(' ,;.') not in EnLanguageTokens.pronouns]
-    if len(mts) > 0:
-        result.update(mts)
+    pronouns = EnLanguageTokens.pronouns
+    for m in regex_matches_to_word_coords(NOUN_PTN_RE, sentence, sent_start):
+        if m[0].lower().strip(' ,;.') not in pronouns:
+            result.setdefault((m[1], m[2]), m[0])
 
     # cases 2, 4, 5, 6
-    for _ in TRIGGER_QUOTED_DEFINITION_RE.finditer(sentence):
+    if TRIGGER_QUOTED_DEFINITION_RE.search(sentence):
         for quoted_definition_re in QUOTED_DEFINITION_RE:
-            result.update(regex_matches_to_word_coords(quoted_definition_re, sentence, sent_start))
-        break
+            for term, start, end in regex_matches_to_word_coords(quoted_definition_re, sentence, sent_start):
+                result.setdefault((start, end), term)
 
     # make definitions out of entries
-    for term, start, end in result:
-        term_cleared = TextBeautifier.strip_pair_symbols((term, start, end))
+    for (start, end), term in result.items():
+        term_cleared = strip_pair_symbols_coords(term, start, end)
         term_cleared = trim_defined_term(term_cleared[0], term_cleared[1], term_cleared[2])
-        was_quoted = term_cleared[3]
-
-        if PICK_DEFINITION_FROM_QUOTES:
-            term, start, end = term_cleared[0], term_cleared[1], term_cleared[2]
-
-        if not term_cleared[0]:
+        term, start, end, was_quoted = term_cleared
+        if not term:
             continue
 
-        term, start, end = TextBeautifier.unify_quotes_braces_coords(
-            term, start, end)
+        term, start, end = unify_quotes_braces_coords(term, start, end)
 
         # check the term is not empty
         if len(term.strip(PUNCTUATION_STRIP_STR)) == 0:
             continue
 
         # returns [('word', 'token', (word_start, word_end)), ...] ...
-        term_pos = list(SpanTokenizer.get_token_spans(term))
+        term_pos = get_term_token_spans(term)
         if does_term_are_service_words(term_pos):
             continue
 
@@ -325,8 +377,7 @@ def get_definition_list_in_sentence(sentence_coords: Tuple[int, int, str],
         if was_quoted:
             max_words_per_definition = MAX_QUOTED_TERM_TOKENS
 
-        words_in_term = sum(1 for w in word_processor.split_text_on_words(term_cleared[0])
-                            if not w.is_separator)
+        words_in_term = count_words_in_term(term_cleared[0])
         quotes_in_text = get_quotes_count_in_string(term_cleared[0])
         possible_definitions = quotes_in_text // 2 if quotes_in_text > 1 else 1
         possible_tokens_count = max_words_per_definition * possible_definitions
@@ -337,12 +388,68 @@ def get_definition_list_in_sentence(sentence_coords: Tuple[int, int, str],
             term, sentence_coords, start, end)
 
         for definition, s, e in split_definitions_lst:
-            definition, s, e = TextBeautifier.strip_pair_symbols((definition, s, e))
+            definition, s, e = strip_pair_symbols_coords(definition, s, e)
             definitions.append(DefinitionCaught(definition, sentence, (s, e)))
 
     return definitions
 
 
+def _cached_by_term(func):
+    """
+    Memoize func(term, start, end) -> (term, start, end, ...) on the term alone:
+    func may only shift the coords by the symbols it strips or replaces,
+    so the shifts found once for a term are applied to any other coords
+    """
+    @functools.lru_cache(maxsize=4096)
+    def get_shifted(term: str) -> tuple:
+        return func(term, 0, 0)
+
+    @functools.wraps(func)
+    def wrapper(term, start, end):
+        shifted = get_shifted(term)
+        return (shifted[0], start + shifted[1], end + shifted[2]) + shifted[3:]
+
+    wrapper.cache_clear = get_shifted.cache_clear
+    return wrapper
+
+
+@_cached_by_term
+def strip_pair_symbols_coords(term: str, start: int, end: int) -> Tuple[str, int, int]:
+    """
+    Memoized TextBeautifier.strip_pair_symbols((term, start, end))
+    """
+    return TextBeautifier.strip_pair_symbols((term, start, end))
+
+
+@_cached_by_term
+def unify_quotes_braces_coords(term: str, start: int, end: int) -> Tuple[str, int, int]:
+    """
+    Memoized TextBeautifier.unify_quotes_braces_coords(term, start, end)
+    """
+    return TextBeautifier.unify_quotes_braces_coords(term, start, end)
+
+
+@functools.lru_cache(maxsize=4096)
+def get_term_token_spans(term: str) -> Tuple[Tuple[str, str, int, int], ...]:
+    """
+    Memoized SpanTokenizer.get_token_spans(): the same terms are
+    found over and over again within a document
+    :param term: a candidate definition
+    :return: ((word, POS tag, word_start, word_end), ...)
+    """
+    return tuple(SpanTokenizer.get_token_spans(term))
+
+
+@functools.lru_cache(maxsize=4096)
+def count_words_in_term(term: str) -> int:
+    """
+    :param term: a candidate definition
+    :return: count of words (not separators) within the term,
+      the same words LineProcessor.split_text_on_words() finds
+    """
+    return len(LineProcessor.word_separator_pattern.findall(term))
+
+
 def split_definitions_inside_term(term: str,
                                   src_with_coords: Tuple[int, int, str],
                                   term_start: int,
@@ -378,7 +485,7 @@ def split_definitions_inside_term(term: str,
     return match_coords
 
 
-def does_term_are_service_words(term_pos: List[Tuple[str, str, int, int]]) -> bool:
+def does_term_are_service_words(term_pos: Sequence[Tuple[str, str, int, int]]) -> bool:
     """
     Does term consist of service words only?
     """
@@ -388,6 +495,7 @@ def does_term_are_service_words(term_pos: List[Tuple[str, str, int, int]]) -> bo
     return True
 
 
+@_cached_by_term
 def trim_defined_term(term: str, start: int, end: int) -> \
         Tuple[str, int, int, bool]:
     """
@@ -402,18 +510,17 @@ def trim_defined_term(term: str, start: int, end: int) -> \
     was_quoted = False
 
     # pick text from quotes
-    # pick text from quotes
-    quoted_parts = [m.group() for m in QUOTED_TEXT_RE.finditer(term)]
+    quoted_parts = get_quoted_text_parts(term)
     if len(quoted_parts) == 1:
         term = quoted_parts[0].strip('''\"'“„''')
         was_quoted = True
 
     orig_term_len = len(term)
-    orig_term_quotes = count_sequence_matches(term, lambda c: c in TextBeautifier.QUOTES)
-    term, start, end = TextBeautifier.strip_pair_symbols((term, start, end))
+    orig_term_quotes = sum(term.count(q) for q in TextBeautifier.QUOTES)
+    term, start, end = strip_pair_symbols_coords(term, start, end)
     if len(term) < orig_term_len:
         # probably we removed quotes
-        updated_term_quotes = count_sequence_matches(term, lambda c: c in TextBeautifier.QUOTES)
+        updated_term_quotes = sum(term.count(q) for q in TextBeautifier.QUOTES)
         was_quoted = was_quoted or orig_term_quotes - updated_term_quotes > 1
 
     term = term.replace('\n', ' ')
@@ -423,7 +530,7 @@ def trim_defined_term(term: str, start: int, end: int) -> \
         term, start, end, STRIP_PUNCT_SYMBOLS)
 
     # strip all dots or just left one (if ends with abbreviation)
-    ends_with_abbr = ABBREVIATION_ENDING_RE.search(term)
+    ends_with_abbr = ends_with_abbreviation(term)
     if not ends_with_abbr:
         term, start, end = TextBeautifier.strip_string_coords(
             term, start, end, '.')
@@ -434,15 +541,27 @@ def trim_defined_term(term: str, start: int, end: int) -> \
     return term, start, end, was_quoted
 
 
+def ends_with_abbreviation(term: str) -> bool:
+    """
+    :param term: a defined term
+    :return: True if the term ends with one of EnLanguageTokens.abbreviations
+    """
+    for length, abbreviations in ABBREVIATIONS_BY_LENGTH.items():
+        if length <= len(term) and term[-length:] in abbreviations:
+            return True
+    return False
+
+
 def filter_definitions_for_self_repeating(definitions: List[DefinitionCaught]) -> List[DefinitionCaught]:
     """
     :param definitions:
     :return: excludes definitions that are "overlapped", leaves unique definitions only
     """
+    overlapping = get_overlapping_definitions(definitions)
     for i, a in enumerate(definitions):
         if not a.name:
             continue
-        for j in range(i + 1, len(definitions)):
+        for j in overlapping[i]:
             b = definitions[j]
             consumes = a.does_consume_target(b)
             if consumes == 1:
@@ -453,22 +572,95 @@ def filter_definitions_for_self_repeating(definitions: List[DefinitionCaught]) -
     return [d for d in definitions if d.name is not None]
 
 
+def get_overlapping_definitions(definitions: List[DefinitionCaught]) -> List[List[int]]:
+    """
+    Find overlapping definitions with a sweep over the sorted coords instead
+    of comparing every pair.
+    :param definitions: definitions found within the document
+    :return: for each definition - ascending indices of the following definitions that overlap it
+    """
+    overlapping: List[List[int]] = [[] for _ in definitions]
+    ordered = []
+    reversed_coords = []  # start > end: can't be swept, checked pairwise
+    for i, d in enumerate(definitions):
+        if d.coords[0] <= d.coords[1]:
+            ordered.append(i)
+        else:
+            reversed_coords.append(i)
+    ordered.sort(key=lambda i: definitions[i].coords[0])
+
+    open_definitions: List[Tuple[int, int]] = []  # heap of (end, index)
+    for i in ordered:
+        start, end = definitions[i].coords
+        while open_definitions and open_definitions[0][0] < start:
+            heapq.heappop(open_definitions)
+        for _, j in open_definitions:
+            overlapping[min(i, j)].append(max(i, j))
+        heapq.heappush(open_definitions, (end, i))
+
+    checked = set()
+    for i in reversed_coords:
+        checked.add(i)
+        for j, d in enumerate(definitions):
+            if j not in checked and definitions[i].overlaps(d):
+                overlapping[min(i, j)].append(max(i, j))
+
+    for indices in overlapping:
+        indices.sort()
+    return overlapping
+
+
 def get_quotes_count_in_string(text: str) -> int:
     """
     :param text: text to calculate quotes within
     :return: calculates count of quotes within the text passed
     """
-    c = Counter(text)
-    return sum(filter(None, [c['"'], c['”']]))
+    return text.count('"') + text.count('”')
+
+
+def get_quoted_text_parts(text: str) -> List[str]:
+    """
+    Finds the same parts as QUOTED_TEXT_RE.finditer(text) with a plain scan:
+    the text from an opening quote up to the next same quote, a quote
+    escaped with backslash doesn't close the part
+    :param text: text to search for quoted parts
+    :return: quoted parts along with their quotes
+    """
+    parts = []
+    length = len(text)
+    search_opening = QUOTED_TEXT_OPENING_RE.search
+    match = search_opening(text)
+    while match:
+        i, quote = match.start(), match.group()
+        # the part has at least one (maybe escaped) character inside
+        j = i + (3 if text[i + 1:i + 2] == '\\' else 2)
+        while j < length and text[j] != quote:
+            j += 2 if text[j] == '\\' else 1
+        if j < length:
+            parts.append(text[i:j + 1])
+            match = search_opening(text, j + 1)
+        else:
+            match = search_opening(text, i + 1)
+    return parts
 
 
 def regex_matches_to_word_coords(pattern: Pattern[str],
-                                 text: str, phrase_start: int = 0) -> List[Tuple[str, int, int]]:
+                                 text: str, phrase_start: int = 0) -> Generator[Tuple[str, int, int], None, None]:
     """
     :param pattern: pattern for searching for matches within the text
     :param text: text to search for matches
     :param phrase_start: a value to be add to start / end
     :return: tuples of (match_text, start, end) out of the regex (pattern) matches in text
     """
-    return [(m.group(), m.start() + phrase_start, m.end() + phrase_start)
-            for m in pattern.finditer(text)]
+    for m in pattern.finditer(text):
+        yield m.group(), m.start() + phrase_start, m.end() + phrase_start
+
+
+def __getattr__(name: str):
+    # ABBREVIATION_ENDING_RE is only compiled if somebody still asks for it:
+    # an alternation of all the abbreviations is slow to build
+    if name == 'ABBREVIATION_ENDING_RE':
+        pattern = re.compile(f'({ABBREVIATION_PTRN})$')
+        globals()[name] = pattern
+        return pattern
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
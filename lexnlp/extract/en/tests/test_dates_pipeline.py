@@ -67,3 +67,37 @@ def test_check_date_parts_are_in_date_month_validation():
         'delimiters': []
     }
     assert not check_date_parts_are_in_date(base_date, mismatched_props, month_lookup=dates.MONTH_BY_NAME)
+
+
+def test_get_date_annotations_without_classifier():
+    text = 'Dated as of June 1, 2017.'
+    annotations = list(dates.get_date_annotations(text, base_date=datetime.datetime(2017, 1, 1), classify=False))
+
+    assert [annotation.date for annotation in annotations] == [datetime.date(2017, 6, 1)]
+    assert annotations[0].score is None
+    assert list(dates.get_dates(text, base_date=datetime.datetime(2017, 1, 1), classify=False)) == \
+        [datetime.date(2017, 6, 1)]
+
+
+def test_pipeline_skips_text_without_date_hints():
+    text = 'The parties shall act in good faith.'
+    outcomes = list(dates._candidate_outcomes(text, False, datetime.datetime(2017, 1, 1), Locale('en-US')))
+    assert outcomes == []
+
+
+def test_normalize_day_of_strips_lowercase_ordinal_only():
+    finder = dates.DateFinder(base_date=datetime.datetime(2017, 1, 1))
+    locale = Locale('en-US')
+
+    def normalize(modifier):
+        previous = dates.CandidateDate(raw_text=modifier, span=(0, len(modifier)),
+                                       props={'digits_modifier': [modifier]},
+                                       index=0, date_finder=finder, locale=locale)
+        candidate = dates.CandidateDate(raw_text=' of June', span=(len(modifier), len(modifier) + 8),
+                                        props={'extra_tokens': ['of'], 'digits_modifier': []},
+                                        index=1, date_finder=finder, locale=locale)
+        outcome = dates.CandidateOutcome(candidate=previous, accepted=False)
+        return dates._normalize_day_of(candidate, previous, outcome).normalized_text
+
+    assert normalize('21st') == '21 of June'
+    assert normalize('21ST') == '21ST of June'
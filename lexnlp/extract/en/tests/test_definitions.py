@@ -25,7 +25,8 @@ from unittest import TestCase
 
 from lexnlp.extract.common.annotation_locator_type import AnnotationLocatorType
 from lexnlp.extract.ml.environment import ENV_EN_DATA_DIRECTORY
-from lexnlp.extract.en.definition_parsing_methods import trim_defined_term, NOUN_PTN_RE, get_definition_list_in_sentence
+from lexnlp.extract.en.definition_parsing_methods import trim_defined_term, NOUN_PTN_RE, get_definition_list_in_sentence, \
+    DefinitionCaught, filter_definitions_for_self_repeating, get_quoted_text_parts, QUOTED_TEXT_RE
 from lexnlp.extract.en.definitions import \
     get_definitions_explicit, get_definitions_in_sentence, get_definition_annotations, parser_ml_classifier, \
     get_definitions
@@ -50,6 +51,17 @@ class TestEnglishDefinitions(TestCase):
         term_cleared, _, _, _ = trim_defined_term(term, 5, 31)
         self.assertEqual('Deed of Trust', term_cleared)
 
+    def test_trim_defined_term_abbreviation(self):
+        term_cleared, start, end, _ = trim_defined_term('"Acme Inc."', 0, 11)
+        self.assertEqual(('Acme Inc.', 0, 11), (term_cleared, start, end))
+        term_cleared, _, _, _ = trim_defined_term('"Acme Company."', 0, 15)
+        self.assertEqual('Acme Company', term_cleared)
+
+    def test_quoted_text_parts(self):
+        for text in ['the words "person" and “whoever“', '"Lender\\"s Loan" \'X', '"" "\\', 'no quotes']:
+            self.assertEqual([m.group() for m in QUOTED_TEXT_RE.finditer(text)], get_quoted_text_parts(text))
+        self.assertEqual(['"person"', '“whoever“'], get_quoted_text_parts('the words "person" and “whoever“'))
+
     def test_definition_quoted(self):
         sentence = '''THIS DEED OF TRUST, ASSIGNMENT, SECURITY AGREEMENT AND FINANCING
 STATEMENT (this "Deed of Trust") dated August 29, 1997, is executed and
@@ -420,6 +432,16 @@ of income of the Borrower for such period.
         defs = list(get_definitions(text))
         self.assertGreater(len(defs), 12)
 
+    def test_filter_self_repeating(self):
+        definitions = [DefinitionCaught('Interest Expense', '', (30, 46)),
+                       DefinitionCaught('Borrower', '', (0, 8)),
+                       DefinitionCaught('Expense', '', (39, 46)),
+                       DefinitionCaught('Interest', '', (25, 33)),
+                       DefinitionCaught('Borrower', '', (60, 68))]
+        filtered = filter_definitions_for_self_repeating(definitions)
+        self.assertEqual([('Interest Expense', (30, 46)), ('Borrower', (0, 8)), ('Borrower', (60, 68))],
+                         [(d.name, d.coords) for d in filtered])
+
     def test_superscript_numerical(self):
         text = "“Definiendum”²³ shall mean a word, phrase, or symbol which is the subject of a definition."
         definitions = list(get_definitions(text))
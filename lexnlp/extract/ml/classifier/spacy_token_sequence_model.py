@@ -16,7 +16,8 @@ from lexnlp.extract.ml.classifier.base_token_sequence_classifier_model import Ba
 
 
 MODULE_PATH = os.path.abspath(os.path.dirname(__file__))
-NLP_EN = spacy.load('en_core_web_sm')
+# token features only read pos_ / tag_ / dep_, so named entities and lemmas are never needed
+NLP_EN = spacy.load('en_core_web_sm', exclude=['ner', 'lemmatizer'])
 
 
 # TODO: Refactor to support multiple languages
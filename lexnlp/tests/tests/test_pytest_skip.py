@@ -0,0 +1,54 @@
+"""Unit tests for turning missing optional assets into skipped tests."""
+
+import os
+from types import SimpleNamespace
+from unittest import TestCase
+
+from lexnlp._pytest_skip import maybe_skip
+
+
+MISSING_ASSET = os.path.join('lexnlp', 'test_data', 'nope.csv')
+
+
+def _report():
+    return SimpleNamespace(outcome='failed', wasxfail=None, longrepr=None)
+
+
+def _excinfo(exc):
+    return SimpleNamespace(value=exc)
+
+
+def _raise_caught(fn):
+    try:
+        fn()
+    except BaseException as e:  # pylint: disable=broad-except
+        return e
+    raise AssertionError('nothing raised')
+
+
+class TestMaybeSkip(TestCase):
+    def test_missing_asset_is_skipped(self):
+        exc = FileNotFoundError(2, 'No such file or directory', MISSING_ASSET)
+        report = _report()
+        self.assertTrue(maybe_skip(report, _excinfo(exc)))
+        self.assertEqual('skipped', report.outcome)
+
+    def test_raised_from_missing_asset_is_skipped(self):
+        def fail():
+            try:
+                open(MISSING_ASSET)
+            except FileNotFoundError as e:
+                raise RuntimeError('cannot load test data') from e
+        self.assertTrue(maybe_skip(_report(), _excinfo(_raise_caught(fail))))
+
+    def test_assertion_in_handler_still_fails(self):
+        def fail():
+            try:
+                open(MISSING_ASSET)
+            except FileNotFoundError:
+                assert False, 'fallback is broken'
+        exc = _raise_caught(fail)
+        self.assertIsInstance(exc.__context__, FileNotFoundError)
+        report = _report()
+        self.assertFalse(maybe_skip(report, _excinfo(exc)))
+        self.assertEqual('failed', report.outcome)
@@ -1,7 +1,13 @@
 import joblib
 
 
-def renamed_load(file_obj):
-    """Wrapper around :func:`joblib.load` kept for backward compatibility."""
+def renamed_load(file_obj, mmap_mode=None):
+    """Wrapper around :func:`joblib.load` kept for backward compatibility.
 
-    return joblib.load(file_obj)
+    ``mmap_mode`` is passed to :func:`joblib.load`: with ``mmap_mode='r'`` the
+    NumPy arrays of an uncompressed joblib dump given by its path are memory-mapped
+    read-only instead of being read into memory, so they must not be modified.
+    joblib ignores it for compressed files and file objects.
+    """
+
+    return joblib.load(file_obj, mmap_mode=mmap_mode)